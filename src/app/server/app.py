@@ -16,6 +16,7 @@ over HTTP using the MCP protocol standard.
 
 from pathlib import Path
 
+import orjson
 from fastapi import FastAPI, Request
 from fastapi.responses import FileResponse
 from fastmcp import FastMCP
@@ -23,7 +24,17 @@ from fastmcp import FastMCP
 from .tools import load_tools
 from .utils import header_store
 
-mcp_server = FastMCP(name="mcp-chatgpt-agentbricks")
+
+def _serialize_tool_result(value) -> str:
+    """Serialize tool return values with orjson.
+
+    Agent responses can be many KB of text; orjson's C encoder is several
+    times faster than the stdlib json encoder FastMCP uses by default.
+    """
+    return orjson.dumps(value).decode()
+
+
+mcp_server = FastMCP(name="mcp-chatgpt-agentbricks", tool_serializer=_serialize_tool_result)
 
 STATIC_DIR = Path(__file__).parent / "../static"
 
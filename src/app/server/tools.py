@@ -12,9 +12,16 @@ Each tool should:
 - Handle errors gracefully
 """
 
+import asyncio
+import hashlib
+import io
 import os
+import threading
+import time
 
-from openai import OpenAI
+import httpx
+from fastmcp import Context
+from openai import APIStatusError, AsyncOpenAI, AuthenticationError, NotFoundError
 
 from server import utils
 
@@ -25,6 +32,132 @@ DATABRICKS_HOST = os.environ.get("DATABRICKS_HOST", "")
 AGENT_ENDPOINT_NAME = os.environ.get("AGENT_ENDPOINT_NAME", "")
 AGENT_DESCRIPTION = os.environ.get("AGENT_DESCRIPTION", "Ask questions to the AI agent")
 
+# Upper bound on simultaneous agent requests issued by ask_agent_many, to stay
+# within serving endpoint rate limits. Override via env if the endpoint allows more.
+ASK_AGENT_MAX_CONCURRENCY = int(os.environ.get("ASK_AGENT_MAX_CONCURRENCY", "8"))
+
+# Environment-derived constants, computed once at import so the hot path does
+# not rebuild the same strings on every tool invocation.
+# _HOST normalizes DATABRICKS_HOST to include the https:// prefix.
+_HOST = DATABRICKS_HOST if DATABRICKS_HOST.startswith("https://") else f"https://{DATABRICKS_HOST}"
+_BASE_URL = f"{_HOST}/serving-endpoints"
+_DEBUG_INFO = {"base_url": _BASE_URL, "endpoint": AGENT_ENDPOINT_NAME}
+
+# ask_agent's docstring is built from AGENT_DESCRIPTION so AI clients see a
+# description of the configured agent. Formatted once at import rather than on
+# each load_tools call; MCP embeds this in the tool schema sent to clients.
+_ASK_AGENT_DOC = f"""{AGENT_DESCRIPTION}
+
+    Args:
+        prompt: The question or message to send to the agent.
+
+    Returns:
+        dict: The agent's response or an error message.
+    """
+
+# Shared async OpenAI client, created lazily on first use.
+# The host and endpoint are fixed for the lifetime of the process, so a single
+# client with a keep-alive connection pool lets consecutive calls reuse TLS
+# sessions and sockets instead of paying the handshake cost on every request.
+# The per-user OBO token is passed per call via an Authorization header, so the
+# client itself holds no credentials and is safe to share across requests.
+_openai_client = None
+_openai_client_lock = threading.Lock()
+
+
+def _get_openai_client() -> AsyncOpenAI:
+    """Return the shared async OpenAI client, creating it on first use."""
+    global _openai_client
+    if _openai_client is None:
+        with _openai_client_lock:
+            if _openai_client is None:
+                _openai_client = AsyncOpenAI(
+                    # Placeholder only - the real OBO token is sent per call
+                    api_key="obo-token-per-request",
+                    base_url=_BASE_URL,
+                    http_client=httpx.AsyncClient(
+                        limits=httpx.Limits(max_keepalive_connections=32),
+                    ),
+                )
+    return _openai_client
+
+
+def _extract_text(response) -> str:
+    """Extract the text fragments from a responses API result.
+
+    Walks response.output[].content[].text and joins the fragments with
+    spaces. Returns an empty string if the response carries no text.
+    getattr with a default is cheaper than hasattr-then-access (hasattr is
+    itself a getattr wrapped in exception handling), and writing fragments
+    straight into a StringIO builder avoids materializing an intermediate
+    list plus a second full copy from join-then-strip.
+    """
+    buf = io.StringIO()
+    first = True
+    for output in getattr(response, "output", None) or ():
+        for item in getattr(output, "content", None) or ():
+            if text := getattr(item, "text", None):
+                if not first:
+                    buf.write(" ")
+                buf.write(text)
+                first = False
+    if first:
+        return ""
+    return buf.getvalue().strip()
+
+
+def _fetch_current_user():
+    """Fetch the current user via a user-authenticated workspace client.
+
+    This is a blocking SDK call; async tools should run it via asyncio.to_thread
+    so it does not stall the event loop.
+    """
+    w = utils.get_user_authenticated_workspace_client()
+    return w.current_user.me()
+
+
+# Short-TTL cache of user identity keyed by a hash of the OBO token (never the
+# raw token). Identity is stable for the lifetime of a token, so repeat
+# get_current_user calls from the same session skip the SCIM round-trip.
+_USER_CACHE: dict[str, tuple[float, dict]] = {}
+_USER_CACHE_LOCK = threading.Lock()
+_USER_CACHE_TTL_SECONDS = 300
+_USER_CACHE_MAX_SIZE = 1024
+
+
+def _user_cache_key(token: str | None) -> str | None:
+    """Derive a cache key from the OBO token, or None if there is no token."""
+    if not token:
+        return None
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def _user_cache_get(key: str) -> dict | None:
+    """Return the cached user info for key, dropping it if expired."""
+    entry = _USER_CACHE.get(key)
+    if entry is None:
+        return None
+    inserted_at, user_info = entry
+    if time.monotonic() - inserted_at >= _USER_CACHE_TTL_SECONDS:
+        with _USER_CACHE_LOCK:
+            _USER_CACHE.pop(key, None)
+        return None
+    return user_info
+
+
+def _user_cache_put(key: str, user_info: dict) -> None:
+    """Store user info for key, clearing the cache if it has grown too large."""
+    with _USER_CACHE_LOCK:
+        if len(_USER_CACHE) >= _USER_CACHE_MAX_SIZE:
+            _USER_CACHE.clear()
+        _USER_CACHE[key] = (time.monotonic(), user_info)
+
+
+def _user_cache_invalidate(key: str) -> None:
+    """Drop the cached entry for key, e.g. after an authorization failure."""
+    with _USER_CACHE_LOCK:
+        _USER_CACHE.pop(key, None)
+
 
 def load_tools(mcp_server):
     """
@@ -47,8 +180,24 @@ def load_tools(mcp_server):
             return {"result": f"Processed {param}"}
     """
 
+    # Validate agent configuration once at registration time. These env vars
+    # are process-constant, so the agent tools only need a single
+    # "is there a config error" branch per call instead of rechecking each var.
+    if not DATABRICKS_HOST:
+        config_error = {
+            "error": "DATABRICKS_HOST not configured",
+            "message": "The DATABRICKS_HOST environment variable is not set. This should be automatic in Databricks Apps.",
+        }
+    elif not AGENT_ENDPOINT_NAME:
+        config_error = {
+            "error": "AGENT_ENDPOINT_NAME not configured",
+            "message": "The AGENT_ENDPOINT_NAME environment variable is not set.",
+        }
+    else:
+        config_error = None
+
     @mcp_server.tool
-    def health(deep: bool = False) -> dict:
+    async def health(deep: bool = False) -> dict:
         """
         Check the health of the MCP server and optionally verify OAuth and agent connectivity.
 
@@ -127,8 +276,7 @@ def load_tools(mcp_server):
         # 3. User authentication check (validates token works)
         # This may fail if OBO is not enabled - treat as warning, not error
         try:
-            w = utils.get_user_authenticated_workspace_client()
-            user = w.current_user.me()
+            user = await asyncio.to_thread(_fetch_current_user)
             checks["user_auth"] = {"status": "ok", "user": user.user_name}
         except Exception as e:
             error_msg = str(e)
@@ -162,30 +310,29 @@ def load_tools(mcp_server):
         # 5. Agent connectivity check (only if we have token and config)
         if token and DATABRICKS_HOST and AGENT_ENDPOINT_NAME:
             try:
-                host = DATABRICKS_HOST if DATABRICKS_HOST.startswith("https://") else f"https://{DATABRICKS_HOST}"
-                base_url = f"{host}/serving-endpoints"
-                client = OpenAI(api_key=token, base_url=base_url)
+                client = _get_openai_client()
 
                 # Send a minimal test message
-                response = client.responses.create(
+                response = await client.responses.create(
                     model=AGENT_ENDPOINT_NAME,
                     input=[{"role": "user", "content": "health check"}],
+                    extra_headers={"Authorization": f"Bearer {token}"},
                 )
 
                 # If we get here without exception, the agent is reachable
                 checks["agent_connectivity"] = {"status": "ok", "message": "Agent responded"}
+            except AuthenticationError:
+                # 401 could be OBO token issue or permissions - treat as warning
+                checks["agent_connectivity"] = {
+                    "status": "warning",
+                    "message": "Authentication failed (401). Check OBO is enabled and user has CAN_QUERY permission.",
+                }
+                issues.append("agent_connectivity")
+            except NotFoundError:
+                checks["agent_connectivity"] = {"status": "error", "message": f"Endpoint '{AGENT_ENDPOINT_NAME}' not found (404)"}
+                issues.append("agent_connectivity")
             except Exception as e:
-                error_msg = str(e)
-                if "401" in error_msg:
-                    # 401 could be OBO token issue or permissions - treat as warning
-                    checks["agent_connectivity"] = {
-                        "status": "warning",
-                        "message": "Authentication failed (401). Check OBO is enabled and user has CAN_QUERY permission.",
-                    }
-                elif "404" in error_msg:
-                    checks["agent_connectivity"] = {"status": "error", "message": f"Endpoint '{AGENT_ENDPOINT_NAME}' not found (404)"}
-                else:
-                    checks["agent_connectivity"] = {"status": "error", "message": error_msg}
+                checks["agent_connectivity"] = {"status": "error", "message": str(e)}
                 issues.append("agent_connectivity")
         elif not token:
             checks["agent_connectivity"] = {
@@ -214,7 +361,7 @@ def load_tools(mcp_server):
         }
 
     @mcp_server.tool
-    def get_current_user() -> dict:
+    async def get_current_user() -> dict:
         """
         Get information about the current authenticated user.
 
@@ -245,19 +392,34 @@ def load_tools(mcp_server):
         Raises:
             Returns error dict if authentication fails or user info cannot be retrieved.
         """
+        cache_key = None
         try:
-            w = utils.get_user_authenticated_workspace_client()
-            user = w.current_user.me()
-            return {
+            # Serve from the per-token cache when possible; identity is stable
+            # for the lifetime of an OBO token. No caching when running locally
+            # without a token.
+            cache_key = _user_cache_key(utils.get_user_token())
+            if cache_key is not None:
+                cached = _user_cache_get(cache_key)
+                if cached is not None:
+                    return dict(cached)
+
+            user = await asyncio.to_thread(_fetch_current_user)
+            user_info = {
                 "display_name": user.display_name,
                 "user_name": user.user_name,
                 "active": user.active,
             }
+            if cache_key is not None:
+                _user_cache_put(cache_key, user_info)
+            return user_info
         except Exception as e:
+            if cache_key is not None and "unauthorized" in str(e).lower():
+                _user_cache_invalidate(cache_key)
             return {"error": str(e), "message": "Failed to retrieve user information"}
 
     # Define ask_agent with dynamic docstring from AGENT_DESCRIPTION
-    def ask_agent(prompt: str) -> dict:
+    # (ctx is injected by FastMCP and hidden from the tool schema)
+    async def ask_agent(prompt: str, ctx: Context | None = None) -> dict:
         """Placeholder docstring - replaced dynamically."""
         try:
             # Get the user's OBO token
@@ -269,84 +431,182 @@ def load_tools(mcp_server):
                     "message": "This tool requires OBO authentication. Running locally without token.",
                 }
 
-            # Validate configuration
-            if not DATABRICKS_HOST:
-                return {
-                    "error": "DATABRICKS_HOST not configured",
-                    "message": "The DATABRICKS_HOST environment variable is not set. This should be automatic in Databricks Apps.",
-                }
-            if not AGENT_ENDPOINT_NAME:
-                return {
-                    "error": "AGENT_ENDPOINT_NAME not configured",
-                    "message": "The AGENT_ENDPOINT_NAME environment variable is not set.",
-                }
+            # Configuration was validated once in load_tools
+            if config_error is not None:
+                return dict(config_error)
 
-            # Create OpenAI client pointing to Databricks serving endpoints
-            # Ensure DATABRICKS_HOST has https:// prefix
-            host = DATABRICKS_HOST if DATABRICKS_HOST.startswith("https://") else f"https://{DATABRICKS_HOST}"
-            base_url = f"{host}/serving-endpoints"
-            client = OpenAI(
-                api_key=token,
-                base_url=base_url,
-            )
+            # Reuse the shared client; the user's OBO token is sent per call
+            client = _get_openai_client()
 
-            # Call the agent using responses.create() API
-            response = client.responses.create(
+            # Call the agent using the streaming responses.create() API, so
+            # text is handled chunk-by-chunk as it arrives instead of buffering
+            # the entire response object first
+            stream = await client.responses.create(
                 model=AGENT_ENDPOINT_NAME,
                 input=[{"role": "user", "content": prompt}],
+                extra_headers={"Authorization": f"Bearer {token}"},
+                stream=True,
             )
 
-            # Extract text from response.output[].content[].text
-            if hasattr(response, "output") and response.output:
-                texts = []
-                for output in response.output:
-                    if hasattr(output, "content"):
-                        for item in output.content:
-                            if hasattr(item, "text") and item.text:
-                                texts.append(item.text)
-                if texts:
-                    return {"response": " ".join(texts).strip()}
-
-            # Fallback: return raw response for debugging
+            # Deltas go straight into a StringIO builder: one growing buffer
+            # instead of a fragment list plus a full joined copy at the end
+            buf = io.StringIO()
+            deltas_received = 0
+            final_response = None
+            terminal_event = None
+            async for event in stream:
+                event_type = getattr(event, "type", "")
+                if event_type == "response.output_text.delta":
+                    delta = getattr(event, "delta", "")
+                    if delta:
+                        buf.write(delta)
+                        deltas_received += 1
+                        # Forward each delta so clients that track progress see
+                        # output as it is generated, not only at completion
+                        if ctx is not None:
+                            await ctx.report_progress(progress=deltas_received, message=delta)
+                elif event_type in ("response.completed", "response.failed", "response.incomplete"):
+                    # All terminal events carry the final response object. The
+                    # SDK does not raise for in-band failures after the HTTP
+                    # 200, so failed/incomplete must be handled here
+                    final_response = getattr(event, "response", None)
+                    terminal_event = event_type
+
+            if terminal_event == "response.failed":
+                error = getattr(final_response, "error", None)
+                return {
+                    "error": getattr(error, "message", None) or str(error or final_response),
+                    "message": "The agent reported a failure while generating the response",
+                    "debug": dict(_DEBUG_INFO),
+                }
+
+            # Prefer the streamed deltas; fall back to extracting from the
+            # final response for endpoints that emit no text deltas
+            if deltas_received:
+                text = buf.getvalue().strip()
+            elif final_response is not None:
+                text = _extract_text(final_response)
+            else:
+                text = ""
+
+            if text:
+                result = {"response": text}
+                if terminal_event == "response.incomplete":
+                    details = getattr(final_response, "incomplete_details", None)
+                    reason = getattr(details, "reason", None) or "unknown reason"
+                    result["note"] = f"Response incomplete: {reason}"
+                return result
+
+            # Last resort: return the raw response for debugging
             return {
-                "response": str(response),
+                "response": str(final_response),
                 "note": "Could not extract text from response",
             }
 
+        # Typed SDK exceptions give O(1) dispatch on the status code instead of
+        # scanning potentially large error strings for "401"/"404".
+        except AuthenticationError as e:
+            return {
+                "error": str(e),
+                "message": "Authentication failed. Check that the App has serving scopes and user has Can Query permission.",
+            }
+        except NotFoundError as e:
+            return {
+                "error": str(e),
+                "message": f"Endpoint '{AGENT_ENDPOINT_NAME}' not found or not accessible.",
+            }
+        except APIStatusError as e:
+            return {
+                "error": str(e),
+                "message": f"Agent endpoint returned HTTP {e.status_code}",
+                "debug": dict(_DEBUG_INFO),
+            }
         except Exception as e:
-            error_msg = str(e)
-            # Provide more helpful error messages for common issues
-            if "401" in error_msg:
+            return {
+                "error": str(e),
+                "message": "Failed to query the agent",
+                "debug": dict(_DEBUG_INFO),
+            }
+
+    # Set the docstring dynamically from AGENT_DESCRIPTION environment variable
+    ask_agent.__doc__ = _ASK_AGENT_DOC
+
+    # Register the tool with the MCP server
+    mcp_server.tool()(ask_agent)
+
+    @mcp_server.tool
+    async def ask_agent_many(prompts: list[str]) -> list[dict]:
+        """
+        Send multiple independent prompts to the agent concurrently.
+
+        Use this instead of repeated ask_agent calls when several questions do
+        not depend on each other's answers. The prompts are dispatched in
+        parallel (bounded by ASK_AGENT_MAX_CONCURRENCY, default 8, to respect
+        serving endpoint rate limits), so total wall-clock time is roughly the
+        slowest single request rather than the sum of all requests.
+
+        Args:
+            prompts: The questions or messages to send to the agent. Each is
+                     answered independently; no conversation state is shared.
+
+        Returns:
+            list[dict]: One result per prompt, in the same order as the input.
+                        Each entry is either {"response": ...} or an error dict
+                        matching ask_agent's error format.
+        """
+        try:
+            token = utils.get_user_token()
+
+            if token is None:
+                error = {
+                    "error": "No OBO token available",
+                    "message": "This tool requires OBO authentication. Running locally without token.",
+                }
+                return [dict(error) for _ in prompts]
+
+            if config_error is not None:
+                return [dict(config_error) for _ in prompts]
+        except Exception as e:
+            error = {"error": str(e), "message": "Failed to query the agent"}
+            return [dict(error) for _ in prompts]
+
+        client = _get_openai_client()
+        headers = {"Authorization": f"Bearer {token}"}
+        semaphore = asyncio.Semaphore(ASK_AGENT_MAX_CONCURRENCY)
+
+        async def ask_one(prompt: str) -> dict:
+            try:
+                async with semaphore:
+                    response = await client.responses.create(
+                        model=AGENT_ENDPOINT_NAME,
+                        input=[{"role": "user", "content": prompt}],
+                        extra_headers=headers,
+                    )
+            except AuthenticationError as e:
                 return {
-                    "error": error_msg,
+                    "error": str(e),
                     "message": "Authentication failed. Check that the App has serving scopes and user has Can Query permission.",
                 }
-            if "404" in error_msg:
+            except NotFoundError as e:
                 return {
-                    "error": error_msg,
+                    "error": str(e),
                     "message": f"Endpoint '{AGENT_ENDPOINT_NAME}' not found or not accessible.",
                 }
-            # Normalize host for debug output
-            debug_host = DATABRICKS_HOST if DATABRICKS_HOST.startswith("https://") else f"https://{DATABRICKS_HOST}"
+            except Exception as e:
+                return {
+                    "error": str(e),
+                    "message": "Failed to query the agent",
+                    "debug": dict(_DEBUG_INFO),
+                }
+
+            text = _extract_text(response)
+            if text:
+                return {"response": text}
             return {
-                "error": error_msg,
-                "message": "Failed to query the agent",
-                "debug": {
-                    "base_url": f"{debug_host}/serving-endpoints",
-                    "endpoint": AGENT_ENDPOINT_NAME,
-                },
+                "response": str(response),
+                "note": "Could not extract text from response",
             }
 
-    # Set the docstring dynamically from AGENT_DESCRIPTION environment variable
-    ask_agent.__doc__ = f"""{AGENT_DESCRIPTION}
-
-    Args:
-        prompt: The question or message to send to the agent.
-
-    Returns:
-        dict: The agent's response or an error message.
-    """
-
-    # Register the tool with the MCP server
-    mcp_server.tool()(ask_agent)
+        # gather preserves input order regardless of completion order
+        return list(await asyncio.gather(*(ask_one(p) for p in prompts)))
 